@@ -4,14 +4,18 @@ Generate Happy Birthday audio data for ESP32 I2S
 Creates a simple sine wave melody at 16kHz sample rate
 """
 
-import math
-import struct
+import functools
+import os
 import wave
+import numpy as np
 
 # Song configuration
 SAMPLE_RATE = 16000
 DURATION = 10.0  # seconds
 AMPLITUDE = 0.3  # Moderate volume to avoid clipping
+BPM = 120
+BEAT = 60.0 / BPM  # Duration of one beat in seconds
+GAP_SAMPLES = int(0.05 * SAMPLE_RATE)  # Small silent gap between notes
 
 # Note frequencies (in Hz) - Happy Birthday melody
 # C4=261.63, D4=293.66, E4=329.63, F4=349.23, G4=392.00, A4=440.00, B4=493.88, C5=523.25
@@ -30,61 +34,73 @@ MELODY = [
     ('B4', 0.75), ('B4', 0.25), ('A4', 1.0), ('F4', 1.0), ('G4', 1.0), ('F4', 2.0)
 ]
 
+# Melody resolved once at import time to (frequency_hz, duration_s) pairs
+MELODY_BAKED = tuple((NOTES[note], beats * BEAT) for note, beats in MELODY)
+
+# Rendered tones keyed by (frequency, duration), shared across repeated notes
+TONE_CACHE = {}
+
+@functools.lru_cache(maxsize=32)
+def _envelope(samples, fade_samples):
+    """Trapezoid fade-in/out envelope, shared by every tone of the same length"""
+    envelope = np.ones(samples, dtype=np.float32)
+    if fade_samples:
+        envelope[:fade_samples] = np.linspace(0, 1, fade_samples, endpoint=False, dtype=np.float32)
+        envelope[-fade_samples:] = np.linspace(1, 0, fade_samples, endpoint=False, dtype=np.float32)
+    envelope.flags.writeable = False  # Cached, so callers must not modify it
+    return envelope
+
 def generate_tone(frequency, duration, sample_rate, amplitude):
     """Generate a sine wave tone"""
     samples = int(sample_rate * duration)
-    audio_data = []
     
-    for i in range(samples):
-        if frequency == 0:  # Rest
-            sample = 0
-        else:
-            # Generate sine wave with envelope to avoid clicks
-            t = i / sample_rate
-            envelope = 1.0
-            if duration > 0.1:  # Apply envelope for longer notes
-                fade_time = min(0.05, duration / 4)  # 50ms or 1/4 note duration
-                if t < fade_time:
-                    envelope = t / fade_time
-                elif t > duration - fade_time:
-                    envelope = (duration - t) / fade_time
-            
-            sample = amplitude * envelope * math.sin(2 * math.pi * frequency * t)
-        
-        # Convert to 16-bit signed integer
-        sample_int = int(sample * 32767)
-        sample_int = max(-32768, min(32767, sample_int))  # Clamp to 16-bit range
-        audio_data.append(sample_int)
+    if frequency == 0:  # Rest
+        return np.zeros(samples, dtype=np.int16)
     
-    return audio_data
+    # Output is not clamped, so amplitude must keep samples inside int16
+    if not abs(amplitude) <= 1:
+        raise ValueError(f"amplitude magnitude must be at most 1, got {amplitude}")
+    
+    # Phase advance per sample, hoisted so the array only takes one multiply
+    two_pi_f_over_sr = 2 * np.pi * frequency / sample_rate
+    samples_f = np.arange(samples, dtype=np.float64)
+    samples_f *= two_pi_f_over_sr
+    np.sin(samples_f, out=samples_f)
+    
+    # Envelope to avoid clicks
+    fade_samples = 0
+    if duration > 0.1:  # Apply envelope for longer notes
+        fade_time = min(0.05, duration / 4)  # 50ms or 1/4 note duration
+        fade_samples = int(fade_time * sample_rate)
+    samples_f *= _envelope(samples, fade_samples)
+    
+    # Scale and convert to 16-bit signed integer; |amplitude| <= 1.0 keeps
+    # sine times envelope within +/-32767, so no clamp is needed
+    samples_f *= amplitude * 32767
+    return samples_f.astype(np.int16)
 
 def generate_happy_birthday():
     """Generate the complete Happy Birthday song"""
-    bpm = 120
-    beat_duration = 60.0 / bpm  # Duration of one beat in seconds
-    
-    all_audio_data = []
+    # Lay out every note up front so the whole song fits one buffer;
+    # repeated pitch/duration pairs reuse the same rendered tone
+    layout = []
+    offset = 0
+    for key in MELODY_BAKED:
+        if key not in TONE_CACHE:
+            frequency, duration = key
+            TONE_CACHE[key] = generate_tone(frequency, duration, SAMPLE_RATE, AMPLITUDE)
+        tone_data = TONE_CACHE[key]
+        layout.append((offset, tone_data))
+        offset += len(tone_data) + GAP_SAMPLES  # Gap is left as zeros
     
-    for note, beats in MELODY:
-        frequency = NOTES[note]
-        duration = beats * beat_duration
-        tone_data = generate_tone(frequency, duration, SAMPLE_RATE, AMPLITUDE)
-        all_audio_data.extend(tone_data)
-        
-        # Add small gap between notes
-        gap_data = generate_tone(0, 0.05, SAMPLE_RATE, 0)
-        all_audio_data.extend(gap_data)
-    
-    # Pad or trim to exactly 10 seconds
+    # Pad or trim to exactly 10 seconds; padding and gaps stay as silence
     target_samples = int(SAMPLE_RATE * DURATION)
-    if len(all_audio_data) < target_samples:
-        # Pad with silence
-        all_audio_data.extend([0] * (target_samples - len(all_audio_data)))
-    elif len(all_audio_data) > target_samples:
-        # Trim to exact length
-        all_audio_data = all_audio_data[:target_samples]
+    all_audio_data = np.zeros(max(offset, target_samples), dtype=np.int16)
     
-    return all_audio_data
+    for offset, tone_data in layout:
+        all_audio_data[offset:offset + len(tone_data)] = tone_data
+    
+    return all_audio_data[:target_samples]
 
 def save_wav_file(audio_data, filename):
     """Save audio data as WAV file"""
@@ -93,37 +109,28 @@ def save_wav_file(audio_data, filename):
         wav_file.setsampwidth(2)  # 16-bit
         wav_file.setframerate(SAMPLE_RATE)
         
-        # Convert to bytes
-        for sample in audio_data:
-            wav_file.writeframes(struct.pack('<h', sample))
+        # Convert to little-endian bytes in one block
+        wav_file.writeframes(audio_data.astype('<i2', copy=False).tobytes())
 
 def generate_rust_array(audio_data, filename):
-    """Generate Rust array for embedding in code"""
+    """Generate Rust source embedding the audio via a raw .bin sidecar"""
+    # Raw little-endian 16-bit samples, pulled in with include_bytes!
+    bin_filename = os.path.splitext(filename)[0] + ".bin"
+    with open(bin_filename, 'wb') as f:
+        f.write(audio_data.astype('<i2', copy=False).tobytes())
+    
+    parts = [
+        "// Happy Birthday audio data - 16kHz, 16-bit, mono, 10 seconds\n",
+        "// Generated automatically - do not edit\n\n",
+        "#[allow(dead_code)]\n",
+        f'pub const HAPPY_BIRTHDAY_AUDIO: &[u8] = include_bytes!("{os.path.basename(bin_filename)}");\n\n',
+        f"pub const SAMPLE_RATE: u32 = {SAMPLE_RATE};\n",
+        f"pub const AUDIO_LENGTH_SECONDS: f32 = {DURATION};\n",
+        f"pub const AUDIO_SAMPLES: usize = {len(audio_data)};\n",
+    ]
+    
     with open(filename, 'w') as f:
-        f.write("// Happy Birthday audio data - 16kHz, 16-bit, mono, 10 seconds\n")
-        f.write("// Generated automatically - do not edit\n\n")
-        f.write("#[allow(dead_code)]\n")
-        f.write("pub const HAPPY_BIRTHDAY_AUDIO: &[u8] = &[\n")
-        
-        # Convert 16-bit samples to little-endian bytes
-        bytes_data = []
-        for sample in audio_data:
-            # Convert to little-endian 16-bit
-            bytes_data.extend(struct.pack('<h', sample))
-        
-        # Write bytes in rows of 16
-        for i in range(0, len(bytes_data), 16):
-            row = bytes_data[i:i+16]
-            hex_values = [f"0x{b:02x}" for b in row]
-            f.write("    " + ", ".join(hex_values))
-            if i + 16 < len(bytes_data):
-                f.write(",")
-            f.write("\n")
-        
-        f.write("];\n\n")
-        f.write(f"pub const SAMPLE_RATE: u32 = {SAMPLE_RATE};\n")
-        f.write(f"pub const AUDIO_LENGTH_SECONDS: f32 = {DURATION};\n")
-        f.write(f"pub const AUDIO_SAMPLES: usize = {len(audio_data)};\n")
+        f.write("".join(parts))
 
 def main():
     print("Generating Happy Birthday audio data...")
@@ -137,7 +144,7 @@ def main():
     
     # Generate Rust array
     generate_rust_array(audio_data, "happy_birthday_audio.rs")
-    print("Generated Rust audio data: happy_birthday_audio.rs")
+    print("Generated Rust audio data: happy_birthday_audio.rs + happy_birthday_audio.bin")
     
     print("\nAudio specifications:")
     print(f"- Sample rate: {SAMPLE_RATE} Hz")
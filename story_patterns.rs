@@ -36,11 +36,11 @@ const ADDING_ROOF_PATTERN: &[u16] = &[
 const ADDING_LOVE_PATTERN: &[u16] = &[
     0x4555, 0x475c, 0x4c8f, 0x52a5, 0x56f3, 0x577a, 0x539f, 0x4c28, 
     0x42aa, 0x38b4, 0x2f3b, 0x267f, 0x1e61, 0x16eb, 0x1095, 0x0c3a, 
-    0x0aaa, 0x0c3a, 0x1095, 0x16eb, 0x1e61, 0x267f, 0x2f3b, 0x38b4, 
+    0x0aaa, 0x0c3a, 0x1095, 0x16eb, 0x1e61, 0x267f, 0x2f3c, 0x38b4, 
     0x42aa, 0x4c28, 0x539f, 0x577a, 0x56f3, 0x52a5, 0x4c8f, 0x475c, 
     0x4555, 0x475c, 0x4c8f, 0x52a5, 0x56f3, 0x577a, 0x539f, 0x4c28, 
     0x42aa, 0x38b4, 0x2f3b, 0x267f, 0x1e61, 0x16eb, 0x1095, 0x0c3a, 
-    0x0aaa, 0x0c3a, 0x1095, 0x16eb, 0x1e61, 0x267f, 0x2f3b, 0x38b4, 
+    0x0aaa, 0x0c3a, 0x1095, 0x16eb, 0x1e61, 0x267f, 0x2f3c, 0x38b4, 
     0x42aa, 0x4c28, 0x539f, 0x577a, 0x56f3, 0x52a5, 0x4c8f, 0x475c
 ];
 
@@ -49,7 +49,7 @@ const HAPPY_ENDING_PATTERN: &[u16] = &[
     0x6d41, 0x7179, 0x7536, 0x7871, 0x7b20, 0x7d3e, 0x7ec5, 0x7fb1, 
     0x8000, 0x7fb1, 0x7ec5, 0x7d3e, 0x7b20, 0x7871, 0x7536, 0x7179, 
     0x6d41, 0x6899, 0x638e, 0x5e2b, 0x587d, 0x5294, 0x4c7c, 0x4645, 
-    0x4000, 0x39ba, 0x3383, 0x2d6b, 0x2782, 0x21d4, 0x1c71, 0x1766, 
+    0x3fff, 0x39ba, 0x3383, 0x2d6b, 0x2782, 0x21d4, 0x1c71, 0x1766, 
     0x12be, 0x0e86, 0x0ac9, 0x078e, 0x04df, 0x02c1, 0x013a, 0x004e, 
     0x0000, 0x004e, 0x013a, 0x02c1, 0x04df, 0x078e, 0x0ac9, 0x0e86, 
     0x12be, 0x1766, 0x1c71, 0x21d4, 0x2782, 0x2d6b, 0x3383, 0x39ba
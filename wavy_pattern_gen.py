@@ -4,144 +4,96 @@ Visual Pattern Generator for ESP32 I2S Oscilloscope Display
 Creates custom patterns that look good on oscilloscope screens
 """
 
+import argparse
 import math
-import matplotlib.pyplot as plt
 import numpy as np
 
 def generate_square_wave(samples=64, amplitude=0x8000, duty_cycle=0.5):
     """Generate a square wave pattern"""
-    pattern = []
-    high_samples = int(samples * duty_cycle)
-    
-    for i in range(samples):
-        if i < high_samples:
-            pattern.append(amplitude)
-        else:
-            pattern.append(0x0000)
+    pattern = np.full(samples, 0x0000, dtype=np.uint16)
+    pattern[:max(0, int(samples * duty_cycle))] = amplitude
     
     return pattern
 
 def generate_triangle_wave(samples=64, amplitude=0x8000):
     """Generate a triangle wave pattern"""
-    pattern = []
+    i = np.arange(samples)
     half_samples = samples // 2
+    if samples and not half_samples:
+        raise ValueError("triangle wave needs at least 2 samples")
     
-    for i in range(samples):
-        if i < half_samples:
-            # Rising edge
-            value = int((i / half_samples) * amplitude)
-        else:
-            # Falling edge
-            value = int(((samples - i) / half_samples) * amplitude)
-        pattern.append(value)
-    
-    return pattern
+    rising = (i / half_samples) * amplitude
+    falling = ((samples - i) / half_samples) * amplitude
+    values = np.where(i < half_samples, rising, falling)
+    return np.clip(values, 0, 0xFFFF).astype(np.uint16)
 
 def generate_sawtooth_wave(samples=64, amplitude=0x8000):
     """Generate a sawtooth wave pattern"""
-    pattern = []
-    
-    for i in range(samples):
-        value = int((i / samples) * amplitude)
-        pattern.append(value)
-    
-    return pattern
+    values = (np.arange(samples) / samples) * amplitude
+    return np.clip(values, 0, 0xFFFF).astype(np.uint16)
 
 def generate_sine_wave(samples=64, amplitude=0x4000, cycles=2):
     """Generate a sine wave pattern"""
-    pattern = []
+    # float32 phase selects NumPy's SIMD sin/cos kernels; max() lets samples=0 return empty
+    angle = np.arange(samples, dtype=np.float32) * np.float32(2 * math.pi * cycles / max(samples, 1))
     
-    for i in range(samples):
-        angle = (i / samples) * 2 * math.pi * cycles
-        value = int(amplitude + amplitude * math.sin(angle))
-        pattern.append(max(0, min(0xFFFF, value)))
-    
-    return pattern
+    values = amplitude + amplitude * np.sin(angle)
+    return np.clip(values, 0, 0xFFFF).astype(np.uint16)
 
 def generate_staircase(samples=64, steps=8, amplitude=0x8000):
     """Generate a staircase pattern"""
-    pattern = []
-    samples_per_step = samples // steps
-    
-    for step in range(steps):
-        step_value = int((step / (steps - 1)) * amplitude)
-        for _ in range(samples_per_step):
-            pattern.append(step_value)
+    if steps < 2:
+        raise ValueError("staircase needs at least 2 steps")
+    levels = ((np.arange(steps) / (steps - 1)) * amplitude).astype(np.uint16)
+    pattern = np.repeat(levels, samples // steps)
     
     # Fill remaining samples
-    while len(pattern) < samples:
-        pattern.append(amplitude)
-    
-    return pattern[:samples]
+    return np.pad(pattern, (0, samples - len(pattern)), constant_values=amplitude)
 
 def generate_heart_shape(samples=64, amplitude=0x8000):
     """Generate a heart-shaped pattern"""
-    pattern = []
+    t = np.arange(samples, dtype=np.float32) * np.float32(4 * math.pi / max(samples, 1))  # Two full cycles, float32 as above
     
-    for i in range(samples):
-        t = (i / samples) * 4 * math.pi  # Two full cycles
-        
-        # Heart equation (simplified for oscilloscope)
-        # x = 16sin³(t), y = 13cos(t) - 5cos(2t) - 2cos(3t) - cos(4t)
-        heart_y = 13 * math.cos(t) - 5 * math.cos(2*t) - 2 * math.cos(3*t) - math.cos(4*t)
-        
-        # Normalize and scale
-        normalized = (heart_y + 21) / 42  # Normalize to 0-1
-        value = int(normalized * amplitude)
-        pattern.append(max(0, min(0xFFFF, value)))
+    # Heart equation (simplified for oscilloscope)
+    # x = 16sin³(t), y = 13cos(t) - 5cos(2t) - 2cos(3t) - cos(4t)
+    heart_y = 13 * np.cos(t) - 5 * np.cos(2*t) - 2 * np.cos(3*t) - np.cos(4*t)
     
-    return pattern
+    # Normalize and scale
+    normalized = (heart_y + 21) / 42  # Normalize to 0-1
+    return np.clip(normalized * amplitude, 0, 0xFFFF).astype(np.uint16)
 
 def generate_house_pattern(samples=64, amplitude=0x8000):
     """Generate a house-shaped pattern"""
-    pattern = []
     sections = samples // 8
-    
-    # Foundation
-    for _ in range(sections):
-        pattern.append(int(0.2 * amplitude))
-    
-    # Left wall rising
-    for i in range(sections):
-        value = int((0.2 + 0.4 * (i / sections)) * amplitude)
-        pattern.append(value)
-    
-    # Roof peak
-    for i in range(sections):
-        if i < sections // 2:
-            value = int((0.6 + 0.4 * (i / (sections // 2))) * amplitude)
-        else:
-            value = int((1.0 - 0.4 * ((i - sections // 2) / (sections // 2))) * amplitude)
-        pattern.append(value)
-    
-    # Right wall down
-    for i in range(sections):
-        value = int((0.6 - 0.4 * (i / sections)) * amplitude)
-        pattern.append(value)
-    
-    # Foundation again
-    for _ in range(sections):
-        pattern.append(int(0.2 * amplitude))
-    
-    # Door
-    for i in range(sections):
-        if i < sections // 3 or i > 2 * sections // 3:
-            pattern.append(int(0.2 * amplitude))
-        else:
-            pattern.append(int(0.35 * amplitude))
-    
-    # Window
-    for i in range(sections):
-        if i < sections // 4 or i > 3 * sections // 4:
-            pattern.append(int(0.2 * amplitude))
-        else:
-            pattern.append(int(0.5 * amplitude))
-    
-    # Final foundation
-    for _ in range(sections):
-        pattern.append(int(0.2 * amplitude))
-    
-    return pattern[:samples]
+    i = np.arange(sections)
+    half = sections // 2
+    if sections and not half:
+        raise ValueError("house pattern needs at least 16 samples")
+    base = int(0.2 * amplitude)
+    
+    foundation = np.full(sections, base)
+    left_wall = (0.2 + 0.4 * (i / sections)) * amplitude
+    roof = np.where(i < half,
+                    (0.6 + 0.4 * (i / half)) * amplitude,
+                    (1.0 - 0.4 * ((i - half) / half)) * amplitude)
+    right_wall = (0.6 - 0.4 * (i / sections)) * amplitude
+    door = np.where((i < sections // 3) | (i > 2 * sections // 3),
+                    base, int(0.35 * amplitude))
+    window = np.where((i < sections // 4) | (i > 3 * sections // 4),
+                      base, int(0.5 * amplitude))
+    
+    pattern = np.concatenate([
+        foundation,   # Foundation
+        left_wall,    # Left wall rising
+        roof,         # Roof peak
+        right_wall,   # Right wall down
+        foundation,   # Foundation again
+        door,         # Door
+        window,       # Window
+        foundation,   # Final foundation
+    ])
+    
+    return np.clip(pattern[:samples], 0, 0xFFFF).astype(np.uint16)
 
 def generate_custom_text_pattern(text="HI", samples=64, amplitude=0x8000):
     """Generate a pattern that spells out text (simplified)"""
@@ -175,6 +127,8 @@ def generate_custom_text_pattern(text="HI", samples=64, amplitude=0x8000):
 
 def plot_pattern(pattern, title="Pattern"):
     """Plot the pattern for visualization"""
+    import matplotlib.pyplot as plt  # Imported lazily; only needed for plotting
+    
     plt.figure(figsize=(12, 6))
     plt.plot(pattern, linewidth=2)
     plt.title(f"{title} - {len(pattern)} samples")
@@ -192,20 +146,16 @@ def plot_pattern(pattern, title="Pattern"):
 
 def pattern_to_rust_array(pattern, name="CUSTOM_PATTERN"):
     """Convert pattern to Rust array format"""
-    rust_code = f"const {name}: &[u16] = &[\n"
-    
-    for i in range(0, len(pattern), 8):
-        line = "    "
-        for j in range(8):
-            if i + j < len(pattern):
-                line += f"0x{pattern[i + j]:04x}"
-                if i + j < len(pattern) - 1:
-                    line += ", "
-        line += "\n"
-        rust_code += line
-    
-    rust_code += "];\n"
-    return rust_code
+    values = [f"0x{val:04x}" for val in pattern]
+    
+    # Eight values per row; rows continue with a trailing ", "
+    rows = ["    " + ", ".join(values[i:i + 8]) for i in range(0, len(values), 8)]
+    
+    lines = [f"const {name}: &[u16] = &["]
+    if rows:
+        lines.append(", \n".join(rows))
+    lines.append("];\n")
+    return "\n".join(lines)
 
 def create_story_patterns():
     """Create a series of patterns that tell a visual story"""
@@ -232,22 +182,22 @@ def create_story_patterns():
         print()
     
     # Generate complete Rust code
-    rust_code = "// Visual Story Patterns for ESP32 I2S Oscilloscope Display\n\n"
+    parts = ["// Visual Story Patterns for ESP32 I2S Oscilloscope Display\n\n"]
     
     for name, pattern in patterns.items():
-        rust_code += pattern_to_rust_array(pattern, f"{name.upper()}_PATTERN")
-        rust_code += "\n"
+        parts.append(pattern_to_rust_array(pattern, f"{name.upper()}_PATTERN"))
+        parts.append("\n")
     
     # Create pattern array
-    rust_code += "const STORY_PATTERNS: &[&[u16]] = &[\n"
-    for name in patterns.keys():
-        rust_code += f"    &{name.upper()}_PATTERN,\n"
-    rust_code += "];\n\n"
+    parts.append("const STORY_PATTERNS: &[&[u16]] = &[\n")
+    parts.extend(f"    &{name.upper()}_PATTERN,\n" for name in patterns.keys())
+    parts.append("];\n\n")
     
-    rust_code += 'const STORY_NAMES: &[&str] = &[\n'
-    for name in patterns.keys():
-        rust_code += f'    "{name}",\n'
-    rust_code += "];\n"
+    parts.append('const STORY_NAMES: &[&str] = &[\n')
+    parts.extend(f'    "{name}",\n' for name in patterns.keys())
+    parts.append("];\n")
+    
+    rust_code = "".join(parts)
     
     # Save to file
     with open("story_patterns.rs", "w") as f:
@@ -275,9 +225,15 @@ def generate_oscilloscope_test_patterns():
     
     return test_patterns
 
-def main():
+def main(argv=None):
     """Main function to generate and display patterns"""
     
+    parser = argparse.ArgumentParser(description="ESP32 I2S visual pattern generator")
+    parser.add_argument("--patterns", choices=["story", "test", "plot", "all"], default="story",
+                        help="which outputs to generate (default: story)")
+    args = parser.parse_args(argv)
+    selected = {"story", "test", "plot"} if args.patterns == "all" else {args.patterns}
+    
     print("🎨 ESP32 I2S Visual Pattern Generator 🎨")
     print("=" * 50)
     
@@ -297,16 +253,18 @@ def main():
         print(f"✅ {name}: {len(pattern)} samples")
         
         # Show statistics
-        min_val = min(pattern)
-        max_val = max(pattern)
-        avg_val = sum(pattern) // len(pattern)
+        min_val = int(pattern.min())
+        max_val = int(pattern.max())
+        avg_val = int(pattern.sum()) // len(pattern)
         print(f"   Range: 0x{min_val:04x} - 0x{max_val:04x}, Avg: 0x{avg_val:04x}")
     
     # Generate story patterns
-    story_patterns = create_story_patterns()
+    if "story" in selected:
+        create_story_patterns()
     
     # Generate test patterns
-    test_patterns = generate_oscilloscope_test_patterns()
+    if "test" in selected:
+        generate_oscilloscope_test_patterns()
     
     print("\n🎯 Usage Instructions:")
     print("1. Copy the generated Rust arrays into your ESP32 code")
@@ -324,37 +282,38 @@ def main():
     print("• Bandwidth: 20MHz or higher")
     
     # Plot a few patterns for visualization
-    try:
-        import matplotlib.pyplot as plt
-        
-        print("\n📊 Plotting sample patterns...")
-        
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-        fig.suptitle("ESP32 I2S Visual Patterns for Oscilloscope", fontsize=16)
-        
-        # Plot key patterns
-        patterns_to_plot = [
-            ("Square Wave", patterns["Square Wave"]),
-            ("Heart Shape", patterns["Heart Shape"]),
-            ("House Pattern", patterns["House Pattern"]),
-            ("Staircase", patterns["Staircase"])
-        ]
-        
-        for i, (name, pattern) in enumerate(patterns_to_plot):
-            row, col = i // 2, i % 2
-            axes[row, col].plot(pattern, linewidth=2, marker='o', markersize=3)
-            axes[row, col].set_title(name)
-            axes[row, col].set_xlabel("Sample Index")
-            axes[row, col].set_ylabel("Amplitude")
-            axes[row, col].grid(True, alpha=0.3)
-            axes[row, col].set_ylim(0, 0x8000)
-        
-        plt.tight_layout()
-        plt.savefig("i2s_visual_patterns.png", dpi=300, bbox_inches='tight')
-        print("✅ Saved pattern visualization as 'i2s_visual_patterns.png'")
-        
-    except ImportError:
-        print("📊 Install matplotlib to see pattern visualizations")
+    if "plot" in selected:
+        try:
+            import matplotlib.pyplot as plt
+            
+            print("\n📊 Plotting sample patterns...")
+            
+            fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+            fig.suptitle("ESP32 I2S Visual Patterns for Oscilloscope", fontsize=16)
+            
+            # Plot key patterns
+            patterns_to_plot = [
+                ("Square Wave", patterns["Square Wave"]),
+                ("Heart Shape", patterns["Heart Shape"]),
+                ("House Pattern", patterns["House Pattern"]),
+                ("Staircase", patterns["Staircase"])
+            ]
+            
+            for i, (name, pattern) in enumerate(patterns_to_plot):
+                row, col = i // 2, i % 2
+                axes[row, col].plot(pattern, linewidth=2, marker='o', markersize=3)
+                axes[row, col].set_title(name)
+                axes[row, col].set_xlabel("Sample Index")
+                axes[row, col].set_ylabel("Amplitude")
+                axes[row, col].grid(True, alpha=0.3)
+                axes[row, col].set_ylim(0, 0x8000)
+            
+            plt.tight_layout()
+            plt.savefig("i2s_visual_patterns.png", dpi=300, bbox_inches='tight')
+            print("✅ Saved pattern visualization as 'i2s_visual_patterns.png'")
+            
+        except ImportError:
+            print("📊 Install matplotlib to see pattern visualizations")
     
     print("\n🚀 Ready to create amazing oscilloscope visuals!")
 